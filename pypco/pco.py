@@ -11,6 +11,9 @@ from .auth_config import PCOAuthConfig
 from .exceptions import PCORequestTimeoutException, \
     PCORequestException, PCOUnexpectedRequestException
 
+# Matches runs of slashes in a URL, except the one following the scheme
+_DUPLICATE_SLASHES = re.compile(r'(?<!:)/{2,}')
+
 
 class PCO:  # pylint: disable=too-many-instance-attributes
     """The entry point to the PCO API.
@@ -31,6 +34,8 @@ class PCO:  # pylint: disable=too-many-instance-attributes
             Default: https://upload.planningcenteronline.com/v2/files
         upload_timeout (int): How long to wait (seconds) for uploads to timeout. Default 300.
         timeout_retries (int): How many times to retry requests that have timed out. Default 3.
+        ratelimit_retries (int): How many times to retry rate limited requests that have no
+            Retry-After header. Default 6.
     """
 
     def __init__(  # pylint: disable=too-many-arguments
@@ -44,6 +49,7 @@ class PCO:  # pylint: disable=too-many-instance-attributes
             upload_url: str = 'https://upload.planningcenteronline.com/v2/files',
             upload_timeout: int = 300,
             timeout_retries: int = 3,
+            ratelimit_retries: int = 6,
     ):
 
         self._log = logging.getLogger(__name__)
@@ -51,6 +57,12 @@ class PCO:  # pylint: disable=too-many-instance-attributes
         self._auth_config = PCOAuthConfig(application_id, secret, token, cc_name)
         self._auth_header = self._auth_config.auth_header
 
+        # Standard headers; built once since requests copies them when preparing each request
+        self._headers = {
+            'User-Agent': 'pypco',
+            'Authorization': self._auth_header,
+        }
+
         self.api_base = api_base
         self.timeout = timeout
 
@@ -58,6 +70,7 @@ class PCO:  # pylint: disable=too-many-instance-attributes
         self.upload_timeout = upload_timeout
 
         self.timeout_retries = timeout_retries
+        self.ratelimit_retries = ratelimit_retries
 
         self.session = requests.Session()
 
@@ -86,15 +99,9 @@ class PCO:  # pylint: disable=too-many-instance-attributes
             requests.Response: The response to this request.
         """
 
-        # Standard header
-        headers = {
-            'User-Agent': 'pypco',
-            'Authorization': self._auth_header,
-        }
-
         # Standard params
         request_params = {
-            'headers': headers,
+            'headers': self._headers,
             'params': params,
             'json': payload,
             'timeout': self.upload_timeout if upload else self.timeout
@@ -195,18 +202,35 @@ class PCO:  # pylint: disable=too-many-instance-attributes
             PCORequestTimeoutException: The request to PCO timed out the maximum number of times.
 
         Returns:
-            requests.Response: The response to this request.
+            requests.Response: The response to this request. This is the final rate limited
+            response if it was retried ratelimit_retries times without a Retry-After header.
         """
 
+        backoff_count = 0
+
         while True:
 
             response = self._do_timeout_managed_request(method, url, payload, upload, **params)
 
             if response.status_code == 429:
+                # PCO tells us when to retry; if it doesn't, back off exponentially
+                if 'Retry-After' in response.headers:
+                    retry_after = int(response.headers['Retry-After'])
+                else:
+                    if backoff_count == self.ratelimit_retries:
+                        self._log.debug("Maximum rate limit retries (%d) without Retry-After hit. "
+                                        "Will return rate limited response.",
+                                        self.ratelimit_retries)
+
+                        return response
+
+                    retry_after = 2 ** min(backoff_count, 5)
+                    backoff_count += 1
+
                 self._log.debug("Received rate limit response. Will try again after %d sec(s).",
-                                int(response.headers['Retry-After']))
+                                retry_after)
 
-                time.sleep(int(response.headers['Retry-After']))
+                time.sleep(retry_after)
                 continue
 
             return response
@@ -241,7 +265,7 @@ class PCO:  # pylint: disable=too-many-instance-attributes
 
         if not upload:
             url = url if url.startswith(self.api_base) else f'{self.api_base}{url}'
-            url = re.subn(r'(?<!:)[/]{2,}', '/', url)[0]
+            url = _DUPLICATE_SLASHES.sub('/', url)
 
         self._log.debug("URL cleaning output: \"%s\"", url)
 
@@ -321,11 +345,14 @@ class PCO:  # pylint: disable=too-many-instance-attributes
             PCORequestException: The response from the PCO API indicated an error with your request.
 
         Returns:
-            dict: The payload from the response to this request.
+            dict: The payload from the response to this request, or None if the
+            response has no body (e.g. 204 No Content).
         """
 
         response = self.request_response(method, url, payload, upload, **params)
-        if response.status_code == 204:
+
+        # Check the status and raw bytes first so empty bodies are never decoded
+        if response.status_code == 204 or not response.content:
             return_value = None
         else:
             return_value = response.json()
@@ -437,7 +464,7 @@ class PCO:  # pylint: disable=too-many-instance-attributes
 
         return self.request_response('DELETE', url, **params)
 
-    def iterate(self, url: str, offset: int = 0, per_page: int = 25, **params: str) -> Iterator[dict]:  # pylint: disable=too-many-branches
+    def iterate(self, url: str, offset: int = 0, per_page: int = 25, **params: str) -> Iterator[dict]:
         """Iterate a list of objects in a response, handling pagination.
 
         Basically, this function wraps get in a generator function designed for
@@ -477,36 +504,48 @@ class PCO:  # pylint: disable=too-many-instance-attributes
             if response is None:
                 return
 
+            # An empty page has nothing to index or yield, but may still link to the next one
+            if not response['data']:
+                if 'next' not in response['links']:
+                    return
+
+                offset += per_page
+                continue
+
+            # Index includes and shared meta once per page rather than once per record
+            included = {
+                (include['type'], include['id']): include
+                for include in response.get('included', [])
+            }
+
+            meta = {
+                key: response['meta'][key]
+                for key in ('can_include', 'parent')
+                if key in response['meta']
+            }
+
             for cur in response['data']:
                 record = {
                     'data': cur,
                     'included': [],
-                    'meta': {}
+                    'meta': dict(meta)
                 }
 
-                if 'can_include' in response['meta']:
-                    record['meta']['can_include'] = response['meta']['can_include']
-
-                if 'parent' in response['meta']:
-                    record['meta']['parent'] = response['meta']['parent']
-
                 if 'relationships' in cur:
                     for key in cur['relationships']:
                         relationships = cur['relationships'][key]['data']
 
-                        if relationships is not None:
-                            if isinstance(relationships, dict):
-                                for include in response['included']:
-                                    if include['type'] == relationships['type'] and \
-                                            include['id'] == relationships['id']:
-                                        record['included'].append(include)
-
-                            elif isinstance(relationships, list):
-                                for relationship in relationships:
-                                    for include in response['included']:
-                                        if include['type'] == relationship['type'] and \
-                                                include['id'] == relationship['id']:
-                                            record['included'].append(include)
+                        if relationships is None:
+                            continue
+
+                        if isinstance(relationships, dict):
+                            relationships = [relationships]
+
+                        for relationship in relationships:
+                            include = included.get((relationship['type'], relationship['id']))
+
+                            if include is not None:
+                                record['included'].append(include)
 
                 yield record
 
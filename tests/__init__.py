@@ -101,24 +101,38 @@ class BasePCOVCRTestCase(vcr_unittest.VCRTestCase):
 
     Attributes:
         creds (dict): PCO personal tokens for executing test requests.
+        pco (PCO): A PCO client shared by all tests in the class, so its
+            session (and connection pool) is reused across tests.
     """
 
-    def __init__(self, *args, **kwargs):
+    @classmethod
+    def setUpClass(cls):
 
-        vcr_unittest.VCRTestCase.__init__(self, *args, **kwargs)
+        super().setUpClass()
 
         try:
-            self.creds = get_creds_from_environment()
+            cls.creds = get_creds_from_environment()
         except CredsNotFoundError:
-            self.creds = {}
-            self.creds['application_id'] = 'pico'
-            self.creds['secret'] = 'robot'
+            cls.creds = {}
+            cls.creds['application_id'] = 'pico'
+            cls.creds['secret'] = 'robot'
 
-        self.pco = pypco.PCO(
-            self.creds['application_id'],
-            self.creds['secret']
+        cls.pco = pypco.PCO(
+            cls.creds['application_id'],
+            cls.creds['secret']
             )
 
+    @classmethod
+    def tearDownClass(cls):
+
+        cls.pco.session.close()
+
+        super().tearDownClass()
+
+    def __init__(self, *args, **kwargs):
+
+        vcr_unittest.VCRTestCase.__init__(self, *args, **kwargs)
+
         build_logging_environment()
 
     def _get_vcr(self, **kwargs):
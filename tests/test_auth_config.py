@@ -45,37 +45,20 @@ class TestPCOAuthConfig(BasePCOTestCase):
     def test_invalid_auth(self):
         """Verify an error when we try to get auth type with bad auth."""
 
-        # Test with only auth_id
-        with self.assertRaises(PCOCredentialsException):
-            PCOAuthConfig('bad_app_id').auth_type  # pylint: disable=W0106
-
-        # Test with only secret
-        with self.assertRaises(PCOCredentialsException):
-            PCOAuthConfig(secret='bad_app_secret').auth_type  # pylint: disable=W0106
-
-        # Test with token and auth_id
-        with self.assertRaises(PCOCredentialsException):
-            PCOAuthConfig(application_id='bad_app_id', token='token').auth_type  # pylint: disable=W0106
-
-        # Test with token and secret
-        with self.assertRaises(PCOCredentialsException):
-            PCOAuthConfig(secret='bad_secret', token='bad_token').auth_type  # pylint: disable=W0106
-
-        # Test with org_token and auth_id
-        with self.assertRaises(PCOCredentialsException):
-            PCOAuthConfig(application_id='bad_app_id', cc_name='carlsbad').auth_type  # pylint: disable=W0106
-
-        # Test with org_token and secret
-        with self.assertRaises(PCOCredentialsException):
-            PCOAuthConfig(secret='bad_secret', cc_name='carlsbad').auth_type  # pylint: disable=W0106
-
-        # Test with org_token and token
-        with self.assertRaises(PCOCredentialsException):
-            PCOAuthConfig(token='bad_token', cc_name='carlsbad').auth_type  # pylint: disable=W0106
-
-        # Test with no args
-        with self.assertRaises(PCOCredentialsException):
-            PCOAuthConfig().auth_type  # pylint: disable=W0106
+        invalid_args = [
+            {'application_id': 'bad_app_id'},
+            {'secret': 'bad_app_secret'},
+            {'application_id': 'bad_app_id', 'token': 'token'},
+            {'secret': 'bad_secret', 'token': 'bad_token'},
+            {'application_id': 'bad_app_id', 'cc_name': 'carlsbad'},
+            {'secret': 'bad_secret', 'cc_name': 'carlsbad'},
+            {'token': 'bad_token', 'cc_name': 'carlsbad'},
+            {},
+        ]
+
+        for kwargs in invalid_args:
+            with self.subTest(**kwargs), self.assertRaises(PCOCredentialsException):
+                PCOAuthConfig(**kwargs).auth_type  # pylint: disable=W0106
 
     def test_auth_headers(self):
         """Verify that we get the correct authentication headers."""
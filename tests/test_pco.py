@@ -1,10 +1,10 @@
 """Test the primary pypco entry point -- the PCO object"""
 
-#pylint: disable=protected-access,global-statement
+#pylint: disable=protected-access
 
 import os
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import call, patch
 
 import requests
 from requests.exceptions import SSLError
@@ -17,105 +17,107 @@ from tests import BasePCOTestCase, BasePCOVCRTestCase
 
 # region Side Effect Functions
 
-# Side effect functions and global vars
+# Side effect functions and mock objects
 
-## Timeout testing
-REQUEST_COUNT = 0
-TIMEOUTS = 0
-
-def timeout_se(*_, **__):
-    """A function to mock requests timeouts over multiple responses.
+class MockResponse:
+    """A lightweight stand-in for requests.Response.
 
-    You must set REQUEST_COUNT global variable to 0 and TIMEOUTS global variable to desired
-    number before this function is being called.
+    Cheaper to build than a Mock and exposes only what pypco reads.
 
-    Returns:
-        Mock: A mock response object.
+    Args:
+        status_code (int): The HTTP status code for the response.
+        text (str): The body of the response.
+        headers (dict): The response headers. Defaults to empty.
+        json_data (obj): The object returned by json(). Defaults to None.
     """
 
-    global REQUEST_COUNT, TIMEOUTS #pylint: disable=global-statement
+    def __init__(self, status_code=200, text='', headers=None, json_data=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode()
+        self.headers = {} if headers is None else headers
+        self.json_data = json_data
 
-    REQUEST_COUNT += 1
+    def json(self):
+        """Return our mock JSON data"""
 
-    if REQUEST_COUNT == TIMEOUTS + 1:
-        response = Mock()
-        response.text = ''
-        response.status_code = 200
+        return self.json_data
 
-        return response
+    def raise_for_status(self):
+        """Raise HTTPError for an error status code, like requests.Response."""
 
-    raise requests.exceptions.Timeout()
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} Error', response=self)
 
-## Rate limit handling
-RL_REQUEST_COUNT = 0
-RL_LIMITED_REQUESTS = 0
-
-def ratelimit_se(*_, **__): #pylint: disable=unused-argument
-    """Simulate rate limiting.
+## Timeout testing
+def make_timeout_se(timeouts):
+    """Build a side effect function to mock requests timeouts over multiple responses.
 
-        You must define RL_REQUEST_COUNT and RL_LIMITED_REQUESTS as
-        global variables before calling this function.
+    Args:
+        timeouts (int): The number of requests that time out before one succeeds.
 
-        Returns:
-            Mock: A mock response object.
+    Returns:
+        function: The side effect function.
     """
 
-    global RL_REQUEST_COUNT, RL_LIMITED_REQUESTS
-
-    RL_LIMITED_REQUESTS += 1
-
-    class RateLimitResponse:
-        """Mocking class for rate limited response
-        When this class is called with a req_count > 0, it mock a successful
-        request. Otherwise a rate limited request is mocked.
-        """
+    state = {'count': 0}
+    ok_response = MockResponse()
 
-        @property
-        def status_code(self):
-            """Mock the status code property"""
+    def timeout_se(*_, **__):
+        state['count'] += 1
 
-            if  RL_LIMITED_REQUESTS > RL_REQUEST_COUNT:
-                return 200
+        if state['count'] == timeouts + 1:
+            return ok_response
 
-            return 429
+        raise requests.exceptions.Timeout()
 
-        @property
-        def headers(self):
-            """Mock the headers property"""
+    return timeout_se
 
-            if RL_LIMITED_REQUESTS > RL_REQUEST_COUNT:
-                return {}
+## Rate limit handling
+RL_OK_JSON = {
+    "hello": "world"
+}
+RL_OK_TEXT = json.dumps(RL_OK_JSON)
+
+RL_LIMITED_JSON = {
+    "errors": [
+        {
+            "code": "429",
+            "detail": "Rate limit exceeded: 118 of 100 requests per 20 seconds"
+        }
+    ]
+}
+RL_LIMITED_TEXT = json.dumps(RL_LIMITED_JSON)
 
-            return {"Retry-After": RL_REQUEST_COUNT * 5}
+def make_ratelimit_se(limited_requests):
+    """Build a side effect function to simulate rate limiting.
 
-        @property
-        def text(self):
-            """Mock the text property"""
+    Args:
+        limited_requests (int): The number of requests that are rate limited
+            before one succeeds.
 
-            return json.dumps(RateLimitResponse.json())
+    Returns:
+        function: The side effect function.
+    """
 
-        @staticmethod
-        def json():
-            """Mock the json function"""
+    state = {'count': 0}
+    ok_response = MockResponse(text=RL_OK_TEXT, json_data=RL_OK_JSON)
+    limited_response = MockResponse(
+        status_code=429,
+        text=RL_LIMITED_TEXT,
+        headers={'Retry-After': limited_requests * 5},
+        json_data=RL_LIMITED_JSON
+    )
 
-            if RL_LIMITED_REQUESTS > RL_REQUEST_COUNT:
-                return {
-                    "hello": "world"
-                }
+    def ratelimit_se(*_, **__):
+        state['count'] += 1
 
-            return {
-                "errors": [
-                    {
-                        "code": "429",
-                        "detail": "Rate limit exceeded: 118 of 100 requests per 20 seconds"
-                    }
-                ]
-            }
+        if state['count'] > limited_requests:
+            return ok_response
 
-        def raise_for_status(self):
-            """Placeholder function for requests.response"""
+        return limited_response
 
-    return RateLimitResponse()
+    return ratelimit_se
 
 def connection_error_se(*_, **__):
     """Simulate a requests SSLError being thrown."""
@@ -138,10 +140,10 @@ class TestPrivateRequestFunctions(BasePCOTestCase):
             secret='secret'
         )
 
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = '{"hello": "world"}'
-        mock_request.return_value = mock_response
+        mock_request.return_value = MockResponse(
+            text='{"hello": "world"}',
+            json_data={'hello': 'world'}
+        )
 
         # GET
         pco._do_request(
@@ -208,60 +210,58 @@ class TestPrivateRequestFunctions(BasePCOTestCase):
 
         mock_fh.assert_called_once_with('/file/path', 'rb')
 
-    @patch('requests.Session.request', side_effect=timeout_se)
+    @patch('requests.Session.request')
     def test_do_timeout_managed_request(self, mock_request):
         """Test requests that automatically will retry on timeout."""
 
-        global REQUEST_COUNT, TIMEOUTS
-
         # Setup PCO object and request mock
         pco = pypco.PCO(
             application_id='app_id',
             secret='secret'
         )
 
-        REQUEST_COUNT = 0
-        TIMEOUTS = 0
+        mock_request.reset_mock()
+        mock_request.side_effect = make_timeout_se(0)
 
         pco._do_timeout_managed_request(
             'GET',
             '/test',
         )
 
-        self.assertEqual(REQUEST_COUNT, 1, "Successful request not executed exactly once.")
+        self.assertEqual(mock_request.call_count, 1, "Successful request not executed exactly once.")
 
-        REQUEST_COUNT = 0
-        TIMEOUTS = 1
+        mock_request.reset_mock()
+        mock_request.side_effect = make_timeout_se(1)
 
         pco._do_timeout_managed_request(
             'GET',
             '/test',
         )
 
-        self.assertEqual(REQUEST_COUNT, 2, "Successful request not executed exactly once.")
+        self.assertEqual(mock_request.call_count, 2, "Successful request not executed exactly once.")
 
-        REQUEST_COUNT = 0
-        TIMEOUTS = 1
+        mock_request.reset_mock()
+        mock_request.side_effect = make_timeout_se(1)
 
         pco._do_timeout_managed_request(
             'GET',
             '/test',
         )
 
-        self.assertEqual(REQUEST_COUNT, 2, "Successful request not executed exactly once.")
+        self.assertEqual(mock_request.call_count, 2, "Successful request not executed exactly once.")
 
-        REQUEST_COUNT = 0
-        TIMEOUTS = 2
+        mock_request.reset_mock()
+        mock_request.side_effect = make_timeout_se(2)
 
         pco._do_timeout_managed_request(
             'GET',
             '/test',
         )
 
-        self.assertEqual(REQUEST_COUNT, 3, "Successful request not executed exactly once.")
+        self.assertEqual(mock_request.call_count, 3, "Successful request not executed exactly once.")
 
-        REQUEST_COUNT = 0
-        TIMEOUTS = 3
+        mock_request.reset_mock()
+        mock_request.side_effect = make_timeout_se(3)
 
         with self.assertRaises(PCORequestTimeoutException):
             pco._do_timeout_managed_request(
@@ -285,8 +285,8 @@ class TestPrivateRequestFunctions(BasePCOTestCase):
             timeout_retries=2
         )
 
-        REQUEST_COUNT = 0
-        TIMEOUTS = 2
+        mock_request.reset_mock()
+        mock_request.side_effect = make_timeout_se(2)
 
         with self.assertRaises(PCORequestTimeoutException):
             pco._do_timeout_managed_request(
@@ -294,13 +294,11 @@ class TestPrivateRequestFunctions(BasePCOTestCase):
                 '/test',
             )
 
-    @patch('requests.Session.request', side_effect=ratelimit_se)
+    @patch('requests.Session.request')
     @patch('time.sleep')
     def test_do_ratelimit_managed_request(self, mock_sleep, mock_request):
         """Test automatic rate limit handling."""
 
-        global RL_REQUEST_COUNT, RL_LIMITED_REQUESTS
-
         # Setup PCO object
         pco = pypco.PCO(
             'app_id',
@@ -308,8 +306,7 @@ class TestPrivateRequestFunctions(BasePCOTestCase):
         )
 
         # Test with no rate limiting
-        RL_REQUEST_COUNT = 0
-        RL_LIMITED_REQUESTS = 0
+        mock_request.side_effect = make_ratelimit_se(0)
 
         pco._do_ratelimit_managed_request(
             'GET',
@@ -320,8 +317,7 @@ class TestPrivateRequestFunctions(BasePCOTestCase):
         mock_sleep.assert_not_called()
 
         # Test with rate limiting
-        RL_REQUEST_COUNT = 1
-        RL_LIMITED_REQUESTS = 0
+        mock_request.side_effect = make_ratelimit_se(1)
 
         pco._do_ratelimit_managed_request(
             'GET',
@@ -331,8 +327,7 @@ class TestPrivateRequestFunctions(BasePCOTestCase):
         mock_sleep.assert_called_once_with(5)
 
         # Test with rate limiting (three limited responses)
-        RL_REQUEST_COUNT = 3
-        RL_LIMITED_REQUESTS = 0
+        mock_request.side_effect = make_ratelimit_se(3)
 
         result = pco._do_ratelimit_managed_request(
             'GET',
@@ -342,6 +337,63 @@ class TestPrivateRequestFunctions(BasePCOTestCase):
         mock_sleep.assert_called_with(15)
         self.assertIsNotNone(result, "Didn't get response returned!")
 
+    @patch('requests.Session.request')
+    @patch('time.sleep')
+    def test_do_ratelimit_managed_request_no_retry_after(self, mock_sleep, mock_request):
+        """Test rate limit handling when the response has no Retry-After header."""
+
+        pco = pypco.PCO(
+            'app_id',
+            'secret'
+        )
+
+        mock_request.side_effect = [
+            MockResponse(status_code=429),
+            MockResponse(status_code=429),
+            MockResponse(status_code=429),
+            MockResponse(),
+        ]
+
+        result = pco._do_ratelimit_managed_request(
+            'GET',
+            '/test'
+        )
+
+        self.assertEqual([call(1), call(2), call(4)], mock_sleep.call_args_list)
+        self.assertEqual(200, result.status_code)
+
+    @patch('requests.Session.request')
+    @patch('time.sleep')
+    def test_do_ratelimit_managed_request_max_retries(self, mock_sleep, mock_request):
+        """Test rate limit handling gives up on repeated 429s without Retry-After."""
+
+        pco = pypco.PCO(
+            'app_id',
+            'secret',
+            ratelimit_retries=2
+        )
+
+        mock_request.return_value = MockResponse(status_code=429, text=RL_LIMITED_TEXT)
+
+        result = pco._do_ratelimit_managed_request(
+            'GET',
+            '/test'
+        )
+
+        self.assertEqual(429, result.status_code)
+        self.assertEqual([call(1), call(2)], mock_sleep.call_args_list)
+        self.assertEqual(3, mock_request.call_count)
+
+        # Public entry points surface the final 429 as a PCORequestException
+        mock_sleep.reset_mock()
+
+        with self.assertRaises(PCORequestException) as err_cm:
+            pco.get('/test')
+
+        self.assertEqual(429, err_cm.exception.status_code)
+        self.assertEqual(RL_LIMITED_TEXT, err_cm.exception.response_body)
+        self.assertEqual([call(1), call(2)], mock_sleep.call_args_list)
+
     @patch('requests.Session.request')
     def test_do_url_managed_request(self, mock_request):
         """Test requests with URL cleanup."""
@@ -500,6 +552,21 @@ class TestPublicRequestFunctions(BasePCOVCRTestCase):
         err = exception_ctxt.exception
         self.assertEqual(err.status_code, 404)
 
+    @patch('requests.Session.request')
+    def test_request_json_empty_body(self, mock_request):
+        """Test request_json when the response has no body."""
+
+        pco = self.pco
+
+        mock_response = MockResponse(status_code=200, text='')
+        mock_request.return_value = mock_response
+
+        # requests raises when decoding an empty body, so it must not be decoded at all
+        with patch.object(mock_response, 'json', side_effect=ValueError) as json_mock:
+            self.assertIsNone(pco.request_json('GET', '/people/v2/lists/1097503/run'))
+
+        json_mock.assert_not_called()
+
     def test_get(self):
         """Test the get function."""
 
@@ -577,7 +644,7 @@ class TestPublicRequestFunctions(BasePCOVCRTestCase):
         pco = self.pco
 
         # Get all people w/ default page size of 25
-        all_people = [row for row in pco.iterate('/people/v2/people')]
+        all_people = list(pco.iterate('/people/v2/people'))
         self.assertEqual(200, len(all_people), 'Should have been 200 results in People query.')
 
         # Make sure we got all 200 unique ids
@@ -585,7 +652,7 @@ class TestPublicRequestFunctions(BasePCOVCRTestCase):
         self.assertEqual(200, len(id_set), 'Expected 200 unique people ids.')
 
         # Change default page size to 50
-        all_people = [row for row in pco.iterate('/people/v2/people', per_page=50)]
+        all_people = list(pco.iterate('/people/v2/people', per_page=50))
         self.assertEqual(200, len(all_people), 'Should have been 200 results in People query.')
 
         # Make sure we got all 200 unique ids
@@ -593,7 +660,7 @@ class TestPublicRequestFunctions(BasePCOVCRTestCase):
         self.assertEqual(200, len(id_set), 'Expected 200 unique people ids.')
 
         # Start with a non-zero offset
-        all_people = [row for row in pco.iterate('/people/v2/people', offset=25)]
+        all_people = list(pco.iterate('/people/v2/people', offset=25))
         self.assertEqual(175, len(all_people), 'Should have been 150 results in People query.')
 
         # Make sure we got all 200 unique ids
@@ -605,7 +672,7 @@ class TestPublicRequestFunctions(BasePCOVCRTestCase):
             'where[site_administrator]': 'false',
         }
 
-        all_people = [row for row in pco.iterate('/people/v2/people', include='emails', **query)]
+        all_people = list(pco.iterate('/people/v2/people', include='emails', **query))
         self.assertEqual(199, len(all_people), 'Query did not return expected number of people.')
 
         for person in all_people:
@@ -624,11 +691,11 @@ class TestPublicRequestFunctions(BasePCOVCRTestCase):
             'where[site_administrator]': 'false',
         }
 
-        all_people = [row for row in pco.iterate(
+        all_people = list(pco.iterate(
             '/people/v2/people',
             include='emails,organization',
             **query
-        )]
+        ))
 
         for person in all_people:
             self.assertEqual(2, len(person['included']), 'Expected exactly two includes.')
@@ -652,7 +719,7 @@ class TestPublicRequestFunctions(BasePCOVCRTestCase):
             'where[first_name]': 'Paul',
         }
 
-        all_pauls = [row for row in pco.iterate('/people/v2/people', include='addresses', **query)]
+        all_pauls = list(pco.iterate('/people/v2/people', include='addresses', **query))
 
         self.assertEqual(2, len(all_pauls), 'Unexpected number of people returned.')
 
@@ -672,7 +739,7 @@ class TestPublicRequestFunctions(BasePCOVCRTestCase):
 
         pco = self.pco
 
-        report_templates = [record for record in pco.iterate('/services/v2/report_templates')]
+        report_templates = list(pco.iterate('/services/v2/report_templates'))
 
         self.assertEqual(
             36,
@@ -691,6 +758,69 @@ class TestPublicRequestFunctions(BasePCOVCRTestCase):
         # No response, should give back an empty list
         self.assertEqual([], list(pco.iterate('/people/v2/people')))
 
+    @patch('pypco.PCO.get')
+    def test_iterate_empty_page(self, get_mock):
+        """Test iterate follows the next link past a page with no records."""
+
+        get_mock.side_effect = [
+            {
+                'data': [],
+                'included': [],
+                'meta': {'total_count': 0},
+                'links': {'next': 'https://api.planningcenteronline.com/people/v2/people?offset=25'}
+            },
+            {
+                'data': [{'type': 'Person', 'id': '1'}],
+                'included': [],
+                'meta': {},
+                'links': {}
+            },
+        ]
+
+        pco = self.pco
+
+        all_people = list(pco.iterate('/people/v2/people'))
+
+        self.assertEqual(1, len(all_people))
+        self.assertEqual('1', all_people[0]['data']['id'])
+        self.assertEqual(
+            [
+                call('/people/v2/people', offset=0, per_page=25),
+                call('/people/v2/people', offset=25, per_page=25),
+            ],
+            get_mock.call_args_list
+        )
+
+    @patch('pypco.PCO.get')
+    def test_iterate_lazy_pagination(self, get_mock):
+        """Test iterate only requests a page once its records are needed."""
+
+        get_mock.return_value = {
+            'data': [
+                {'type': 'Person', 'id': '1'},
+                {'type': 'Person', 'id': '2'},
+            ],
+            'included': [],
+            'meta': {},
+            'links': {
+                'next': 'https://api.planningcenteronline.com/people/v2/people?offset=2&per_page=2'
+            }
+        }
+
+        pco = self.pco
+
+        people = pco.iterate('/people/v2/people', per_page=2)
+
+        # Consuming the first page should only fetch the first page
+        self.assertEqual('1', next(people)['data']['id'])
+        self.assertEqual('2', next(people)['data']['id'])
+        get_mock.assert_called_once_with('/people/v2/people', offset=0, per_page=2)
+
+        # Stepping past the page boundary fetches the next one
+        next(people)
+        self.assertEqual(2, get_mock.call_count)
+        get_mock.assert_called_with('/people/v2/people', offset=2, per_page=2)
+
     def test_template(self):
         """Test the template function."""
 
@@ -14,107 +14,112 @@ from pypco.exceptions import PCORequestException
 from pypco.exceptions import PCORequestTimeoutException
 from pypco.exceptions import PCOUnexpectedRequestException
 
-def mock_oauth_response(*args, **kwargs): #pylint: disable=E0211
-    """Provide mocking for an oauth request
-
-    Read more about this technique for mocking HTTP requests here:
-    https://stackoverflow.com/questions/15753390/python-mock-requests-and-the-response/28507806#28507806
+OAUTH_URL = 'https://api.planningcenteronline.com/oauth/token'
+OAUTH_HEADERS = {'User-Agent': 'pypco'}
+
+# Mocked OAuth API payloads
+ACCESS_TOKEN_JSON = {
+    'access_token': '863300f2f093e8be25fdd7f40f218f4276ecf0b5814a558d899730fcee81e898', #pylint: disable=C0301
+    'token_type': 'bearer',
+    'expires_in': 7200,
+    'refresh_token': '63d68cb3d8a46eea1c842f5ba469b2940a88a657992f915206be1253a175b6ad', #pylint: disable=C0301
+    'scope': 'people',
+    'created_at': 1516054388
+}
+
+INVALID_CLIENT_JSON = {
+    'error': 'invalid_client',
+    'error_description': 'Client authentication failed due to unknown client, no client authentication included, or unsupported authentication method.' #pylint: disable=C0301
+}
+
+REFRESH_TOKEN_JSON = {
+    'access_token': '863300f2f093e8be25fdd7f40f218f4276ecf0b5814a558d899730fcee81e898', #pylint: disable=C0301
+    'token_type': 'bearer',
+    'expires_in': 7200,
+    'refresh_token': '63d68cb3d8a46eea1c842f5ba469b2940a88a657992f915206be1253a175b6ad', #pylint: disable=C0301
+    'created_at': 1516054388
+}
+
+INVALID_REFRESH_JSON = {
+    'error': 'invalid_request',
+    'error_description': 'The refresh token is no longer valid'
+}
+
+# Mocked responses keyed by the authorization code or refresh token posted
+CODE_RESPONSES = {
+    'good': (ACCESS_TOKEN_JSON, 200),
+    'bad': (INVALID_CLIENT_JSON, 401),
+    'server_error': ({}, 500),
+}
+
+CODE_EXCEPTIONS = {
+    'timeout': Timeout,
+    'connection': RequestsConnectionError,
+}
+
+REFRESH_RESPONSES = {
+    'refresh_good': (REFRESH_TOKEN_JSON, 200),
+    'refresh_bad': (INVALID_REFRESH_JSON, 401),
+}
+
+class MockOAuthResponse:
+    """Mocking class for OAuth response
+
+        Args:
+            json_data (dict): JSON data returned by the mocked API.
+            status_code (int): The HTTP status code returned by the mocked API.
     """
 
-    class MockOAuthResponse:
-        """Mocking class for OAuth response
+    def __init__(self, json_data, status_code):
 
-            Args:
-                json_data (dict): JSON data returned by the mocked API.
-                status_code (int): The HTTP status code returned by the mocked API.
-        """
+        self.json_data = json_data
+        self.status_code = status_code
+        self.text = '{"test_key": "test_value"}'
 
-        def __init__(self, json_data, status_code):
+    def json(self):
+        """Return our mock JSON data"""
 
-            self.json_data = json_data
-            self.status_code = status_code
-            self.text = '{"test_key": "test_value"}'
+        return self.json_data
 
-        def json(self):
-            """Return our mock JSON data"""
+    def raise_for_status(self):
+        """Raise HTTP exception if status code >= 400."""
 
-            return self.json_data
+        if 400 <= self.status_code <= 500:
+            raise HTTPError(
+                u'%s Client Error: %s for url: %s' % \
+                    (
+                        self.status_code,
+                        'Unauthorized',
+                        OAUTH_URL
+                    ),
+                response=self
+            )
 
-        def raise_for_status(self):
-            """Raise HTTP exception if status code >= 400."""
+def mock_oauth_response(*args, **kwargs): #pylint: disable=E0211
+    """Provide mocking for an oauth request
 
-            if 400 <= self.status_code <= 500:
-                raise HTTPError(
-                    u'%s Client Error: %s for url: %s' % \
-                        (
-                            self.status_code,
-                            'Unauthorized',
-                            'https://api.planningcenteronline.com/oauth/token'
-                        ),
-                    response=self
-                )
+    Read more about this technique for mocking HTTP requests here:
+    https://stackoverflow.com/questions/15753390/python-mock-requests-and-the-response/28507806#28507806
+    """
+
+    data = kwargs.get('data')
 
     # If we have this attrib, we're getting an access token
-    if 'code' in kwargs.get('data'):
-        if args[0] != "https://api.planningcenteronline.com/oauth/token":
+    if 'code' in data:
+        if args[0] != OAUTH_URL:
             return MockOAuthResponse(None, 404)
 
-        if kwargs.get('data')['code'] == 'good':
-            return MockOAuthResponse(
-                {
-                    'access_token': '863300f2f093e8be25fdd7f40f218f4276ecf0b5814a558d899730fcee81e898', #pylint: disable=C0301
-                    'token_type': 'bearer',
-                    'expires_in': 7200,
-                    'refresh_token': '63d68cb3d8a46eea1c842f5ba469b2940a88a657992f915206be1253a175b6ad', #pylint: disable=C0301
-                    'scope': 'people',
-                    'created_at': 1516054388
-                },
-                200
-            )
-
-        if kwargs.get('data')['code'] == 'bad':
-            return MockOAuthResponse(
-                {
-                    'error': 'invalid_client',
-                    'error_description': 'Client authentication failed due to unknown client, no client authentication included, or unsupported authentication method.' #pylint: disable=C0301
-                },
-                401
-            )
+        code = data['code']
 
-        if kwargs.get('data')['code'] == 'server_error':
-            return MockOAuthResponse(
-                {},
-                500
-            )
+        if code in CODE_EXCEPTIONS:
+            raise CODE_EXCEPTIONS[code]()
 
-        if kwargs.get('data')['code'] == 'timeout':
-            raise Timeout()
-
-        if kwargs.get('data')['code'] == 'connection':
-            raise RequestsConnectionError()
+        if code in CODE_RESPONSES:
+            return MockOAuthResponse(*CODE_RESPONSES[code])
 
     # If we have this attrib, we're attempting a refresh
-    if 'refresh_token' in kwargs.get('data'):
-        if kwargs.get('data')['refresh_token'] == 'refresh_good':
-            return MockOAuthResponse(
-                {
-                    'access_token': '863300f2f093e8be25fdd7f40f218f4276ecf0b5814a558d899730fcee81e898', #pylint: disable=C0301
-                    'token_type': 'bearer',
-                    'expires_in': 7200,
-                    'refresh_token': '63d68cb3d8a46eea1c842f5ba469b2940a88a657992f915206be1253a175b6ad', #pylint: disable=C0301
-                    'created_at': 1516054388
-                },
-                200
-            )
-
-        if kwargs.get('data')['refresh_token'] == 'refresh_bad':
-            return MockOAuthResponse(
-                {
-                    'error': 'invalid_request',
-                    'error_description': 'The refresh token is no longer valid'
-                },
-                401
-            )
+    if 'refresh_token' in data and data['refresh_token'] in REFRESH_RESPONSES:
+        return MockOAuthResponse(*REFRESH_RESPONSES[data['refresh_token']])
 
     return MockOAuthResponse(None, 400)
 
@@ -158,63 +163,33 @@ class TestDoOAUTHPost(unittest.TestCase):
     """Test the internal _do_oauth_post function."""
 
     @mock.patch('requests.post', side_effect=mock_oauth_response)
-    def test_oauth_general_errors(self, mock_post): #pylint: disable=unused-argument
-        """Ensure error response with invalid status code"""
-
-        # Request timeout
-        with self.assertRaises(PCORequestTimeoutException):
-            pypco.user_auth_helpers._do_oauth_post( #pylint: disable=protected-access
-                'https://api.planningcenteronline.com/oauth/token',
-                client_id='id',
-                client_secret='secret',
-                code='timeout',
-                redirect_uri='https://www.site.com',
-                grant_type='authorization_code'
-            )
-
-        # Request connection error
-        with self.assertRaises(PCOUnexpectedRequestException):
-            pypco.user_auth_helpers._do_oauth_post( #pylint: disable=protected-access
-                'https://api.planningcenteronline.com/oauth/token',
-                client_id='id',
-                client_secret='secret',
-                code='connection',
-                redirect_uri='https://www.site.com',
-                grant_type='authorization_code'
-            )
-
-    @mock.patch('requests.post', side_effect=mock_oauth_response)
-    def test_http_errors(self, mock_post): #pylint: disable=unused-argument
-        """Ensure error response with http errors."""
-
-        # Incorrect code
-        with self.assertRaises(PCORequestException):
-            pypco.user_auth_helpers._do_oauth_post( #pylint: disable=protected-access
-                'https://api.planningcenteronline.com/oauth/token',
-                client_id='id',
-                client_secret='secret',
-                code='bad',
-                redirect_uri='https://www.site.com',
-                grant_type='authorization_code'
-            )
-
-        # Server error
-        with self.assertRaises(PCORequestException):
-            pypco.user_auth_helpers._do_oauth_post( #pylint: disable=protected-access
-                'https://api.planningcenteronline.com/oauth/token',
-                client_id='id',
-                client_secret='secret',
-                code='server_error',
-                redirect_uri='https://www.site.com',
-                grant_type='authorization_code'
-            )
+    def test_oauth_errors(self, mock_post): #pylint: disable=unused-argument
+        """Ensure request and http errors raise the matching PCO exception."""
+
+        error_cases = [
+            ('timeout', PCORequestTimeoutException),
+            ('connection', PCOUnexpectedRequestException),
+            ('bad', PCORequestException),
+            ('server_error', PCORequestException),
+        ]
+
+        for code, exception in error_cases:
+            with self.subTest(code=code), self.assertRaises(exception):
+                pypco.user_auth_helpers._do_oauth_post( #pylint: disable=protected-access
+                    OAUTH_URL,
+                    client_id='id',
+                    client_secret='secret',
+                    code=code,
+                    redirect_uri='https://www.site.com',
+                    grant_type='authorization_code'
+                )
 
     @mock.patch('requests.post', side_effect=mock_oauth_response)
     def test_successful_post(self, mock_post): #pylint: disable=unused-argument
         """Ensure successful post request execution with correct parameters."""
 
         response = pypco.user_auth_helpers._do_oauth_post( #pylint: disable=protected-access
-            'https://api.planningcenteronline.com/oauth/token',
+            OAUTH_URL,
             client_id='id',
             client_secret='secret',
             code='good',
@@ -225,7 +200,7 @@ class TestDoOAUTHPost(unittest.TestCase):
         self.assertEqual(200, response.status_code)
 
         mock_post.assert_called_once_with(
-            'https://api.planningcenteronline.com/oauth/token',
+            OAUTH_URL,
             data={
                 'client_id': 'id',
                 'client_secret': 'secret',
@@ -233,9 +208,7 @@ class TestDoOAUTHPost(unittest.TestCase):
                 'redirect_uri': 'https://www.site.com',
                 'grant_type': 'authorization_code'
             },
-            headers={
-                'User-Agent': 'pypco'
-            },
+            headers=OAUTH_HEADERS,
             timeout=30
         )
 
@@ -258,7 +231,7 @@ class TestGetOAuthAccessToken(unittest.TestCase):
         )
 
         mock_post.assert_called_once_with(
-            'https://api.planningcenteronline.com/oauth/token',
+            OAUTH_URL,
             data={
                 'client_id': 'id',
                 'client_secret': 'secret',
@@ -266,9 +239,7 @@ class TestGetOAuthAccessToken(unittest.TestCase):
                 'redirect_uri': 'https://www.site.com/',
                 'grant_type': 'authorization_code'
             },
-            headers={
-                'User-Agent': 'pypco'
-            },
+            headers=OAUTH_HEADERS,
             timeout=30
         )
 
@@ -288,7 +259,7 @@ class TestGetOAuthAccessToken(unittest.TestCase):
         self.assertEqual('{"test_key": "test_value"}', err_cm.exception.response_body)
 
         mock_post.assert_called_once_with(
-            'https://api.planningcenteronline.com/oauth/token',
+            OAUTH_URL,
             data={
                 'client_id': 'id',
                 'client_secret': 'secret',
@@ -296,9 +267,7 @@ class TestGetOAuthAccessToken(unittest.TestCase):
                 'redirect_uri': 'https://www.site.com/',
                 'grant_type': 'authorization_code'
             },
-            headers={
-                'User-Agent': 'pypco'
-            },
+            headers=OAUTH_HEADERS,
             timeout=30
         )
 
@@ -321,16 +290,14 @@ class TestGetOAuthRefreshToken(unittest.TestCase):
         )
 
         mock_post.assert_called_once_with(
-            'https://api.planningcenteronline.com/oauth/token',
+            OAUTH_URL,
             data={
                 'client_id': 'id',
                 'client_secret': 'secret',
                 'refresh_token': 'refresh_good',
                 'grant_type': 'refresh_token'
             },
-            headers={
-                'User-Agent': 'pypco'
-            },
+            headers=OAUTH_HEADERS,
             timeout=30
         )
 
@@ -349,16 +316,14 @@ class TestGetOAuthRefreshToken(unittest.TestCase):
         self.assertEqual('{"test_key": "test_value"}', err_cm.exception.response_body)
 
         mock_post.assert_called_once_with(
-            'https://api.planningcenteronline.com/oauth/token',
+            OAUTH_URL,
             data={
                 'client_id': 'id',
                 'client_secret': 'secret',
                 'refresh_token': 'refresh_bad',
                 'grant_type': 'refresh_token'
             },
-            headers={
-                'User-Agent': 'pypco'
-            },
+            headers=OAUTH_HEADERS,
             timeout=30
         )
 
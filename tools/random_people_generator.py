@@ -10,6 +10,7 @@ Expects a PCO_APP_ID and PCO_SECRET to be present as environment variables
 
 import os
 import random
+import string
 import sys
 
 # Not quite sure why we're needing to do this for this import,
@@ -34,12 +35,7 @@ def generate_rand_string(length):
         (str): The random string.
     """
 
-    output = []
-
-    for ndx in range(length): #pylint: disable=unused-variable
-        output += chr(random.randint(97,122))
-
-    return ''.join(output)
+    return ''.join(random.choices(string.ascii_lowercase, k=length))
 
 def generate_people(num_people):
     """Generate the specified number of random people objects.